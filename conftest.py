@@ -5,25 +5,61 @@ This module provides a flexible, extensible architecture for filtering pytest
 test collections through a series of configurable stages.
 """
 
-from abc import ABC, abstractmethod
 from configparser import ConfigParser
 from dataclasses import dataclass
 from datetime import datetime
+import functools
+import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+import re
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, Iterable, Iterator, KeysView, List, Mapping, Optional, Protocol, Set, Tuple, Union
 import pytest
 
 
+logger = logging.getLogger(__name__)
 
-class PipelineStep(ABC):
+# Shared result for items without parameters
+_NO_PARAMS: Mapping[str, str] = MappingProxyType({})
+
+# Marker names already known to each pytest config (ini markers plus groups)
+_registered_markers_key = pytest.StashKey[Set[str]]()
+
+
+def _closest_marker(test: pytest.Item, name: str) -> Optional[pytest.Mark]:
     """
-    Abstract base class for all test filter steps.
+    Get a test's closest marker with the given name.
+    
+    Not memoized, since markers can still be added with add_marker().
+    
+    Args:
+        test: pytest.Item to inspect
+        name: Marker name
+        
+    Returns:
+        The closest matching Mark, or None if the test has none
+    """
+    own_markers = getattr(test, "own_markers", None)
+    if own_markers is None:
+        return test.get_closest_marker(name)
+    # The item's own marks are the closest ones and the common case. Node
+    # keywords include marker names from the whole parent chain, so the
+    # chain walk is only needed when the marker really sits on a parent.
+    mark = next((mark for mark in own_markers if mark.name == name), None)
+    if mark is None and name in test.keywords:
+        mark = test.get_closest_marker(name)
+    return mark
 
-    Each concrete step must implement the apply method to process a list
-    of pytest.Item objects and return a filtered or transformed list.
+
+class PipelineStep(Protocol):
+    """
+    Structural interface for all test filter steps.
+
+    Any object with an apply method that processes a list of pytest.Item
+    objects and returns a filtered or transformed list is a step; concrete
+    steps do not need to inherit from this class.
     """
     
-    @abstractmethod
     def apply(self, tests: List[pytest.Item]) -> Union[List[pytest.Item], Any]:
         """
         Apply filtering logic to the provided test items.
@@ -34,7 +70,7 @@ class PipelineStep(ABC):
         Returns:
             Filtered list of pytest.Item objects or transformed data structure
         """
-        pass
+        ...
 
 class TestFilterPipeline:
     """
@@ -52,7 +88,14 @@ class TestFilterPipeline:
             config: PipelineConfig instance for configuration-driven setup
             stages: List of PipelineStep instances to apply in order (overrides config)
         """
-        self._stages: List[PipelineStep] = stages or []
+        # Always own a fresh list so later add_stage/clear calls never touch the caller's
+        self._stages: List[PipelineStep] = list(stages) if stages else []
+        # Bound apply methods of the stages, kept in sync with _stages. Held as a
+        # tuple that is replaced, never mutated, so a running apply() iterates
+        # a fixed sequence even if stages are added meanwhile.
+        self._apply_fns: Tuple[Callable[[Any], Any], ...] = tuple(stage.apply for stage in self._stages)
+        # Read-only snapshot returned by the stages property, rebuilt lazily
+        self._stages_view: Optional[Tuple[PipelineStep, ...]] = None
         
 
     
@@ -82,6 +125,8 @@ class TestFilterPipeline:
             Self for method chaining
         """
         self._stages.append(stage)
+        self._apply_fns += (stage.apply,)
+        self._stages_view = None
         return self
     
     def apply(self, tests: List[pytest.Item]) -> Any:
@@ -94,26 +139,32 @@ class TestFilterPipeline:
         Returns:
             Result after applying all stages (may be filtered tests or other data)
         """
-        # Build stages from config if none provided
-        if not self._stages:
-            self._build_stages_from_config()
-            
+        # An empty pipeline passes the tests through unchanged
+        apply_fns = self._apply_fns
         result = tests
-        for stage in self._stages:
-            result = stage.apply(result)
+        for apply_stage in apply_fns:
+            result = apply_stage(result)
         return result
     
     def clear(self) -> None:
         """Remove all stages from the pipeline."""
         self._stages.clear()
+        self._apply_fns = ()
+        self._stages_view = None
+    
+    def __iter__(self) -> Iterator[PipelineStep]:
+        """Iterate over the stages in execution order."""
+        return iter(self._stages)
     
     @property
-    def stages(self) -> List[PipelineStep]:
-        """Get a copy of the current stages list."""
-        return self._stages.copy()
+    def stages(self) -> Tuple[PipelineStep, ...]:
+        """Get a read-only snapshot of the current stages."""
+        if self._stages_view is None:
+            self._stages_view = tuple(self._stages)
+        return self._stages_view
 
 
-class DateFilterStage(PipelineStep):
+class DateFilterStage:
     """
     Filter stage that keeps tests based on day-of-week scheduling.
     
@@ -123,16 +174,20 @@ class DateFilterStage(PipelineStep):
     
     # Mapping of weekday names to datetime.weekday() values (Monday=0)
     WEEKDAY_MAP = {
-        'sun': 0, 'sunday': 0,
-        'mon': 1, 'monday': 1,
-        'tue': 2, 'tuesday': 2,
-        'wed': 3, 'wednesday': 3,
-        'thu': 4, 'thursday': 4,
-        'fri': 5, 'friday': 5,
-        'sat': 6, 'saturday': 6
+        'mon': 0, 'monday': 0,
+        'tue': 1, 'tuesday': 1,
+        'wed': 2, 'wednesday': 2,
+        'thu': 3, 'thursday': 3,
+        'fri': 4, 'friday': 4,
+        'sat': 5, 'saturday': 5,
+        'sun': 6, 'sunday': 6
     }
 
-    WEEKEND_DAYS = {5, 6}  # Friday, Saturday
+    # Days matched by the "weekend" token; the token table reads this per class
+    WEEKEND_DAYS: ClassVar[FrozenSet[int]] = frozenset({5, 6})  # Saturday, Sunday
+
+    # Mask of a test that may run on any day
+    ALL_DAYS_MASK = (1 << 7) - 1
     
     def __init__(self, current_time: Optional[datetime] = None) -> None:
         """
@@ -142,6 +197,8 @@ class DateFilterStage(PipelineStep):
             current_time: Override current time for testing (defaults to now)
         """
         self._current_time = current_time
+        # Weekday resolved once and reused by every apply() until reset()
+        self._cached_weekday: Optional[int] = None if current_time is None else current_time.weekday()
     
     def apply(self, tests: List[pytest.Item]) -> List[pytest.Item]:
         """
@@ -153,59 +210,118 @@ class DateFilterStage(PipelineStep):
         Returns:
             Filtered list containing only tests that should run today
         """
-        current_day = (self._current_time or datetime.now()).weekday()
-        filtered_tests = []
-        
-        for test in tests:
-            if self._should_run_today(test, current_day):
-                filtered_tests.append(test)
-        
-        return filtered_tests
+        today_bit = 1 << self.current_weekday()
+        allowed_mask = self.allowed_mask
+        return [test for test in tests if allowed_mask(test) & today_bit]
+    
+    def current_weekday(self) -> int:
+        """Get the weekday (0=Monday) to filter against, reading the clock at most once until reset()."""
+        current_day = self._cached_weekday
+        if current_day is None:
+            current_day = self._cached_weekday = (self._current_time or datetime.now()).weekday()
+        return current_day
     
-    def _should_run_today(self, test: pytest.Item, current_day: int) -> bool:
+    def reset(self) -> None:
+        """Forget the cached weekday so the next apply() reads the clock again."""
+        self._cached_weekday = None
+    
+    def allowed_mask(self, test: pytest.Item) -> int:
         """
-        Check if a test should run on the current day.
+        Get the allowed-days bitmask for a test.
         
         Args:
             test: pytest.Item to check
-            current_day: Current weekday (0=Monday, 6=Sunday)
             
         Returns:
-            True if test should run today, False otherwise
+            Bitmask of allowed weekdays (ALL_DAYS_MASK if the test may run any day)
         """
-        run_days_mark = test.get_closest_marker('run_days')
+        run_days_mark = _closest_marker(test, 'run_days')
         if not run_days_mark:
             # No marker means run always
-            return True
+            return self.ALL_DAYS_MASK
+        # A marker naming no known day also means run always
+        return self._run_days_mask(run_days_mark) or self.ALL_DAYS_MASK
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _token_masks(cls) -> Mapping[str, int]:
+        """
+        Get the run_days token table of this stage class.
+        
+        Built once per class from its WEEKDAY_MAP and WEEKEND_DAYS, with "weekend"
+        folded in so every token resolves through a single dict lookup.
+        
+        Returns:
+            Mapping of lowercased run_days token to weekday bitmask
+        """
+        token_to_mask = {name: 1 << day for name, day in cls.WEEKDAY_MAP.items()}
+        token_to_mask['weekend'] = sum(1 << day for day in cls.WEEKEND_DAYS)
+        return MappingProxyType(token_to_mask)
+    
+    @classmethod
+    def _run_days_mask(cls, run_days_mark: pytest.Mark) -> int:
+        """
+        Get the allowed-days bitmask of a run_days marker.
+        
+        Markers with equal arguments share one parse result per stage class,
+        however many tests or Mark objects carry them.
+        
+        Args:
+            run_days_mark: The run_days Mark to parse
+            
+        Returns:
+            Bitmask of allowed weekdays, or 0 if the marker allows every day
+        """
+        # Lists are turned into tuples so the usual days=[...] form is hashable
+        kwargs_items = tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in run_days_mark.kwargs.items()
+        ))
+        try:
+            return cls._parse_allowed_mask(run_days_mark.args, kwargs_items)
+        except TypeError:
+            # Some other argument is unhashable: parse it without caching
+            return cls._parse_allowed_mask.__wrapped__(cls, run_days_mark.args, kwargs_items)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _parse_allowed_mask(cls, args: Tuple[Any, ...], kwargs_items: Tuple[Tuple[str, Any], ...]) -> int:
+        """
+        Parse run_days marker arguments into a bitmask of the weekdays they allow.
         
-        allowed_days = set()
+        Args:
+            args: Positional marker arguments
+            kwargs_items: Keyword marker arguments as (name, value) pairs
+            
+        Returns:
+            Bitmask with bit N set for each allowed weekday N, or 0 if
+            the arguments name no known day (run always)
+        """
+        token_to_mask = cls._token_masks()
+        mask = 0
         
         # Process marker arguments
-        for arg in run_days_mark.args:
+        for arg in args:
             if isinstance(arg, str):
-                arg_lower = arg.lower()
-                if arg_lower == 'weekend':
-                    allowed_days.update(self.WEEKEND_DAYS)
-                elif arg_lower in self.WEEKDAY_MAP:
-                    allowed_days.add(self.WEEKDAY_MAP[arg_lower])
+                mask |= token_to_mask.get(arg.lower(), 0)
         
         # Process marker keyword arguments
-        for key, value in getattr(run_days_mark, "kwargs", {}).items():
+        for key, value in kwargs_items:
             if key.lower() == 'days' and isinstance(value, (list, tuple)):
                 for day in value:
                     if isinstance(day, str):
-                        day_lower = day.lower()
-                        if day_lower == 'weekend':
-                            allowed_days.update(self.WEEKEND_DAYS)
-                        elif day_lower in self.WEEKDAY_MAP:
-                            allowed_days.add(self.WEEKDAY_MAP[day_lower])
+                        mask |= token_to_mask.get(day.lower(), 0)
         
-        return current_day in allowed_days if allowed_days else True
+        return mask
 
 
 @dataclass
 class FixtureParameterGroups:
     """Data structure holding grouped test results."""
+    # Declared by hand (rather than dataclass(slots=True)) to stay importable
+    # on interpreters older than 3.10
+    __slots__ = ('groups', 'unmatched')
+    
     groups: Dict[str, List[pytest.Item]]
     unmatched: List[pytest.Item]
     
@@ -213,16 +329,21 @@ class FixtureParameterGroups:
         """Get tests for a specific group by name."""
         return self.groups.get(group_name, [])
     
-    def get_all_groups(self) -> Dict[str, List[pytest.Item]]:
-        """Get all groups as a dictionary."""
+    def get_all_groups(self) -> Mapping[str, List[pytest.Item]]:
+        """Get a read-only view of all groups."""
+        # Wrapping is O(1), and a fresh view follows reassignment of groups
+        return MappingProxyType(self.groups)
+    
+    def get_all_groups_copy(self) -> Dict[str, List[pytest.Item]]:
+        """Get all groups as a new dictionary the caller may modify."""
         return self.groups.copy()
     
-    def get_group_names(self) -> List[str]:
-        """Get list of all group names."""
-        return list(self.groups.keys())
+    def get_group_names(self) -> KeysView[str]:
+        """Get a live view of all group names."""
+        return self.groups.keys()
 
 
-class FixtureParameterGroupingStage(PipelineStep):
+class FixtureParameterGroupingStage:
     """
     Stage that groups tests based on fixture parameter values.
     Example:
@@ -247,18 +368,59 @@ class FixtureParameterGroupingStage(PipelineStep):
     def __init__(
         self,
         group_mappings: Dict[str, List[str]],
+        fixture_name: Optional[str] = None,
+        collect_groups: bool = False,
     ) -> None:
         """
         Initialize the fixture parameter grouping stage.
         
         Args:
-            fixture_name: Name of the fixture to inspect for parameters
             group_mappings: Dictionary mapping group names to lists of identifier strings
                           e.g., {"fast": ["quick", "mode_a"], "slow": ["slow", "detailed"]}
+                          (copied; later changes to the dict do not affect the stage)
+            fixture_name: Name of the fixture to inspect for parameters
+                          (defaults to inspecting every parameter of the test)
+            collect_groups: Return FixtureParameterGroups from apply() instead of the
+                          marked tests (the per-group lists are only built when set)
         """
-        self.group_mappings = group_mappings
+        # Read-only copy: the flag and match tables below are derived from it once
+        self.group_mappings: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {name: tuple(identifiers) for name, identifiers in group_mappings.items()}
+        )
+        self.fixture_name = fixture_name
+        self.collect_groups = collect_groups
+        # An empty mapping makes the whole stage a no-op
+        self._has_mappings = bool(group_mappings)
+        # Parallel arrays indexed by group number; matching works on indices
+        # and only the marker step goes back to names
+        self._group_names: List[str] = list(group_mappings)
+        # Parameter string -> indices of every group it matches. Parameter values
+        # repeat heavily across parametrized tests, so each distinct string is
+        # matched against the identifiers only once.
+        self._value_to_idxs: Dict[str, Tuple[int, ...]] = {}
+        # Full parameter-string combination of a test -> its group indices
+        self._group_cache: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
     
-    def apply(self, tests: List[pytest.Item]):
+    @functools.cached_property
+    def _matcher_table(self) -> Tuple[Tuple[int, Callable[[str], Any]], ...]:
+        """
+        (group index, search function) per group, built on first use. Each search
+        function is a compiled alternation of the group's lowercased identifiers, so a
+        parameter string is scanned once per group instead of once per identifier.
+        Groups without identifiers can never match and are left out.
+        """
+        return tuple(
+            (group_index, re.compile("|".join(re.escape(identifier.lower()) for identifier in identifiers)).search)
+            for group_index, identifiers in enumerate(self.group_mappings[name] for name in self._group_names)
+            if identifiers
+        )
+    
+    @functools.cached_property
+    def _group_marks(self) -> List[pytest.MarkDecorator]:
+        """Marker applied for each group, created once on first use instead of per matched test."""
+        return [getattr(pytest.mark, name) for name in self._group_names]
+    
+    def apply(self, tests: List[pytest.Item]) -> Union[List[pytest.Item], FixtureParameterGroups]:
         """
         Group tests based on fixture parameter values containing identifier strings.
         Adds dynamic markers to config file at the start of processing.
@@ -267,36 +429,78 @@ class FixtureParameterGroupingStage(PipelineStep):
             tests: List of pytest.Item objects to group
             
         Returns:
-            FixtureParameterGroups containing the grouped tests with markers applied
+            The same tests with their group markers applied, or FixtureParameterGroups
+            containing the grouped tests when the stage was created with collect_groups=True
 
         Example:
             Group "fast" includes tests which have fixture that has parameters containing "quick" or "mode_a"
             Group "slow" includes tests which have fixture that has parameters containing "slow" or "detailed"
         """
+        if self.collect_groups:
+            return self._collect_groups(tests)
+
+        if not self._has_mappings:
+            # No groups configured, so no test can be assigned or marked
+            return tests
+
+        # Bound method resolved once instead of on every test
+        assign_groups = self.assign_groups
+        for test in tests:
+            assign_groups(test)
+
+        return tests
+
+    def _collect_groups(self, tests: List[pytest.Item]) -> FixtureParameterGroups:
+        """
+        Mark tests like apply() does and also gather them per group.
         
-        groups = {group_name: [] for group_name in self.group_mappings.keys()}
-        unmatched = []
+        Args:
+            tests: List of pytest.Item objects to group
+            
+        Returns:
+            FixtureParameterGroups containing the grouped tests with markers applied
+        """
+        group_names = self._group_names
+        buckets: List[List[pytest.Item]] = [[] for _ in group_names]
+        unmatched: List[pytest.Item] = []
+        unmatched_append = unmatched.append
+        assign_groups = self.assign_groups
 
         for test in tests:
-            assigned_groups = self._find_matching_groups(test)
-            print(f"Test {test.name} assigned to groups: {assigned_groups}")
-            #TODO: Do we want test to be run on a single group only?
+            assigned_groups = assign_groups(test)
             if assigned_groups:
                 # Add test to all matching groups
-                for group_name in assigned_groups:
-                    groups[group_name].append(test)
-                    # Add marker to the test
-                    test.add_marker(pytest.mark.__getattr__(group_name))
+                for group_index in assigned_groups:
+                    buckets[group_index].append(test)
             else:
-                unmatched.append(test)
+                unmatched_append(test)
 
-        return tests
-        # return FixtureParameterGroups(
-        #     groups=groups,
-        #     unmatched=unmatched
-        # )
+        return FixtureParameterGroups(
+            groups=dict(zip(group_names, buckets)),
+            unmatched=unmatched
+        )
+
+    def assign_groups(self, test: pytest.Item) -> Tuple[int, ...]:
+        """
+        Mark a test with every group it matches.
+        
+        Args:
+            test: pytest.Item to group
+            
+        Returns:
+            Indices (into the group name table) of the groups the test was marked with
+        """
+        assigned_groups = self._find_matching_groups(test)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Test %s assigned to groups: %s", test.name, [self._group_names[i] for i in assigned_groups])
+        #TODO: Do we want test to be run on a single group only?
+        group_marks = self._group_marks
+        for group_index in assigned_groups:
+            # Add marker to the test
+            test.add_marker(group_marks[group_index])
+        return assigned_groups
 
-    def _find_matching_groups(self, test: pytest.Item) -> List[str]:
+    def _find_matching_groups(self, test: pytest.Item) -> Tuple[int, ...]:
         """
         Find all groups that a test belongs to based on fixture parameter values.
         
@@ -304,41 +508,196 @@ class FixtureParameterGroupingStage(PipelineStep):
             test: pytest.Item to check
             
         Returns:
-            List of group names the test belongs to
+            Indices (into the group name table) of the groups the test belongs to
             
          Example:
             If a test contains a fixture that its value is "quick", it belongs to group "fast".
             If a test contains a fixture that its value is "slow", it belongs to group "slow".
         """
-        matching_groups = []
-        #take the params of the fixture the test uses and find matching groups
-        parameter_values = []
-        # Prefer callspec params (from @pytest.mark.parametrize or parametrized fixtures)
+        if not self._has_mappings:
+            return ()
         callspec = getattr(test, "callspec", None)
-        if callspec is not None:
-            params = getattr(callspec, "params", {})
-            if isinstance(params, dict):
-                parameter_values.extend(params.values())
-            else:
-                try:
-                    parameter_values.extend(list(params))
-                except Exception:
-                    pass
-
-        # Fall back to funcargs (actual fixture values available at collection time)
-        funcargs = getattr(test, "funcargs", None)
-        if isinstance(funcargs, dict):
-            parameter_values.extend(funcargs.values())
-
-        # Ensure we always have a list to iterate
-        if not parameter_values:
-            parameter_values = []
-        for param_value in parameter_values:
-            for group_name, identifiers in self.group_mappings.items():
-                if any(identifier.lower() in str(param_value).lower() for identifier in identifiers):
-                    matching_groups.append(group_name)
+        fixture_name = self.fixture_name
+        if callspec is None or (fixture_name is not None and fixture_name not in callspec.params):
+            # Not parametrized, or not by the inspected fixture: nothing to match on
+            return ()
+
+        #take the params of the fixture the test uses and find matching groups
+        params = _parameter_strings(test)
+        if fixture_name is None:
+            param_strs: Tuple[str, ...] = tuple(params.values())
+        else:
+            param_strs = (params[fixture_name],)
+
+        # Every variant of a parametrized test with the same parameter values
+        # resolves through this one lookup
+        matching_groups = self._group_cache.get(param_strs)
+        if matching_groups is None:
+            matching_groups = self._group_cache[param_strs] = self._match_parameters(param_strs)
         return matching_groups
     
+    def _match_parameters(self, param_strs: Tuple[str, ...]) -> Tuple[int, ...]:
+        """
+        Match a combination of parameter strings against the groups.
+        
+        Args:
+            param_strs: String forms of the parameter values of one test
+            
+        Returns:
+            Indices of all groups matched by any of the strings, each listed once
+            and in configuration order
+        """
+        matching_groups: Set[int] = set()
+        # Groups without identifiers are not in the table and can never match
+        group_count = len(self._matcher_table)
+        value_to_idxs = self._value_to_idxs
+        for param_str in param_strs:
+            group_indices = value_to_idxs.get(param_str)
+            if group_indices is None:
+                group_indices = value_to_idxs[param_str] = self._match_parameter(param_str)
+            matching_groups.update(group_indices)
+            if len(matching_groups) == group_count:
+                # Every group already matched; later parameters cannot add any
+                break
+        # Configuration order, so markers are applied the same way on every run
+        return tuple(sorted(matching_groups))
+    
+    def _match_parameter(self, param_str: str) -> Tuple[int, ...]:
+        """
+        Match a single parameter string against every group's identifiers.
+        
+        Args:
+            param_str: String form of a fixture parameter value
+            
+        Returns:
+            Indices of all groups with an identifier contained in param_str
+        """
+        lowered = param_str.lower()
+        return tuple(group_index for group_index, search in self._matcher_table if search(lowered))
+    
+
+def _register_group_markers(config: pytest.Config, group_names: Iterable[str]) -> None:
+    """
+    Register group names as markers on a pytest config.
+    
+    Each name is registered at most once per config, and names already
+    declared in the ini "markers" option are left alone.
+    
+    Args:
+        config: pytest config to register the markers on
+        group_names: Names of the groups to register
+    """
+    registered = config.stash.get(_registered_markers_key, None)
+    if registered is None:
+        registered = {
+            line.split(":", 1)[0].split("(", 1)[0].strip()
+            for line in config.getini("markers")
+        }
+        config.stash[_registered_markers_key] = registered
+    
+    for group_name in group_names:
+        if group_name not in registered:
+            config.addinivalue_line("markers", f"{group_name}: Tests belonging to {group_name} group")
+            registered.add(group_name)
+
+
+def _parameter_strings(test: pytest.Item) -> Mapping[str, str]:
+    """
+    Collect the string form of every fixture parameter value of a test.
+    
+    Args:
+        test: pytest.Item to inspect
+        
+    Returns:
+        Mapping of parameter name to the string form of its value,
+        empty if the test is not parametrized
+    """
+    # Params come from @pytest.mark.parametrize or parametrized fixtures. A callspec
+    # always carries a params dict, so one probe on the item is enough. (funcargs
+    # is not consulted: it is only filled in during setup, after collection.)
+    callspec = getattr(test, "callspec", None)
+    if callspec is None:
+        return _NO_PARAMS
+
+    return {
+        name: param_value if isinstance(param_value, str) else str(param_value)
+        for name, param_value in callspec.params.items()
+    }
+
+
+class DateFilterGroupingStage:
+    """
+    Single-pass combination of a DateFilterStage followed by a
+    FixtureParameterGroupingStage.
+
+    Gives the same result as applying the two stages one after the other,
+    but walks the items once: each test is checked against today's run_days
+    mask and, if kept, grouped and marked in the same iteration.
+    """
+    
+    def __init__(
+        self,
+        date_stage: DateFilterStage,
+        grouping_stage: FixtureParameterGroupingStage,
+    ) -> None:
+        """
+        Initialize the combined stage.
+        
+        Args:
+            date_stage: DateFilterStage deciding which tests run today
+            grouping_stage: FixtureParameterGroupingStage grouping and marking the kept tests
+        """
+        self._date_stage = date_stage
+        self._grouping_stage = grouping_stage
+    
+    def apply(self, tests: List[pytest.Item]) -> Union[List[pytest.Item], FixtureParameterGroups]:
+        """
+        Filter tests by run_days and group the ones that are kept.
+        
+        Args:
+            tests: List of pytest.Item objects to filter and group
+            
+        Returns:
+            Tests that should run today, with their group markers applied, or
+            FixtureParameterGroups of those tests when the grouping stage was
+            created with collect_groups=True
+        """
+        date_stage = self._date_stage
+        grouping_stage = self._grouping_stage
+        if grouping_stage.collect_groups:
+            # The grouping stage builds the per-group lists itself; this
+            # uncommon mode runs the two stages one after the other
+            return grouping_stage.apply(date_stage.apply(tests))
+        
+        today_bit = 1 << date_stage.current_weekday()
+        allowed_mask = date_stage.allowed_mask
+        
+        if not grouping_stage.group_mappings:
+            return [test for test in tests if allowed_mask(test) & today_bit]
+        
+        assign_groups = grouping_stage.assign_groups
+        
+        kept: List[pytest.Item] = []
+        kept_append = kept.append
+        for test in tests:
+            if allowed_mask(test) & today_bit:
+                kept_append(test)
+                assign_groups(test)
+        return kept
+
+
+_GROUP_MAPPINGS: Dict[str, List[str]] = {"fast": ["quick", "mode_a"], "slow": ["slow", "detailed"]}
+
+# Only the FixtureParameterGroupingStage is used. Built once at import rather than
+# per collection, so the stage memo tables carry over to later collections in the
+# same process.
+_PIPELINE = TestFilterPipeline().add_stage(FixtureParameterGroupingStage(_GROUP_MAPPINGS))
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the group markers of the pipeline before any test is collected."""
+    _register_group_markers(config, _GROUP_MAPPINGS)
+
 
 # Example usage in pytest_collection_modifyitems hook
 def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
@@ -348,20 +707,14 @@ def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item
     This hook is called after collection is completed and allows modification
     of the collected test items based on pipeline.ini configuration.
     """
-    print("Collected test items:")
-    print(items)
-        
-    pipeline = TestFilterPipeline()
-    
-    #add only the FixtureParameterGroupingStage stage to the pipeline with {"fast": ["quick", "mode_a"], "slow": ["slow", "detailed"]}
-    pipeline.add_stage(FixtureParameterGroupingStage({"fast": ["quick", "mode_a"], "slow": ["slow", "detailed"]}))
-
-    # Apply the pipeline - stages are built from configuration
-    result = pipeline.apply(items)
-    items[:] = result
-    for item in items:
-        print(f"\nTEST: {item.nodeid}")
-        print("MARKERS:", [m.name for m in item.iter_markers()])
+    # Apply the pipeline - stages were built once at import
+    result = _PIPELINE.apply(items)
+    if result is not items:
+        # Stages that only mark tests hand back the same list; skip the copy then
+        items[:] = result
+    if logger.isEnabledFor(logging.DEBUG):
+        for item in items:
+            logger.debug("TEST: %s MARKERS: %s", item.nodeid, [m.name for m in item.iter_markers()])
     # # If the last stage was date filtering, update items with filtered list
     # if isinstance(result, list):
     #     items[:] = result
@@ -1,5 +1,9 @@
 import pytest
 import time
+from datetime import datetime
+
+import conftest
+from conftest import DateFilterGroupingStage, DateFilterStage, FixtureParameterGroupingStage, FixtureParameterGroups
 # Some sleep functions that gets a parameterized fixture
 
 @pytest.fixture(params=["quick", "slow", "group3"])
@@ -10,4 +14,239 @@ def test_sleep(sleep_time):
     print("???????????????????????")
     time.sleep(1)
     print(f"Finished sleeping for {sleep_time}")
-    assert True
\ No newline at end of file
+    assert True
+
+
+class _MarkedItem:
+    """Stand-in for pytest.Item exposing only what DateFilterStage reads."""
+
+    def __init__(self, *marks):
+        self._marks = [mark.mark for mark in marks]
+
+    def get_closest_marker(self, name):
+        return next((mark for mark in self._marks if mark.name == name), None)
+
+
+# 2024-01-01 was a Monday
+@pytest.mark.parametrize("day_of_month, expected", [(1, True), (2, False), (6, True), (7, True)])
+def test_run_days_matches_weekday_names(day_of_month, expected):
+    item = _MarkedItem(pytest.mark.run_days("mon", "weekend"))
+    stage = DateFilterStage(current_time=datetime(2024, 1, day_of_month))
+    assert (stage.apply([item]) == [item]) is expected
+
+
+def test_run_days_days_keyword_and_unmarked_items():
+    tuesday_only = _MarkedItem(pytest.mark.run_days(days=["Tuesday"]))
+    unmarked = _MarkedItem()
+    stage = DateFilterStage(current_time=datetime(2024, 1, 3))  # Wednesday
+    assert stage.apply([tuesday_only, unmarked]) == [unmarked]
+
+
+def test_run_days_uses_the_weekday_tables_of_the_stage_class():
+    class FridayWeekendStage(DateFilterStage):
+        WEEKDAY_MAP = {**DateFilterStage.WEEKDAY_MAP, "freitag": 4}
+        WEEKEND_DAYS = frozenset({4, 5, 6})
+
+    weekend = _MarkedItem(pytest.mark.run_days("weekend"))
+    freitag = _MarkedItem(pytest.mark.run_days("Freitag"))
+    friday = datetime(2024, 1, 5)
+    assert FridayWeekendStage(current_time=friday).apply([weekend, freitag]) == [weekend, freitag]
+    # The base class still knows no "freitag" (run always) and keeps its own weekend
+    assert DateFilterStage(current_time=friday).apply([weekend, freitag]) == [freitag]
+
+
+def test_fixture_parameter_groups_views_follow_reassigned_groups():
+    groups = FixtureParameterGroups(groups={"a": []}, unmatched=[])
+    groups.groups = {"b": []}
+    assert dict(groups.get_all_groups()) == groups.get_all_groups_copy() == {"b": []}
+    assert list(groups.get_group_names()) == ["b"]
+
+
+_DATED_PARAMETRIZED_MODULE = """
+    import pytest
+
+    @pytest.mark.parametrize("mode", ["quick", "slow_detailed", "other"])
+    def test_any_day(mode): pass
+
+    @pytest.mark.run_days("tue")
+    @pytest.mark.parametrize("mode", ["quick", "slow"])
+    def test_tuesday(mode): pass
+
+    def test_plain(): pass
+"""
+
+
+def _group_markers(item):
+    return [mark.name for mark in item.iter_markers() if mark.name in ("fast", "slow")]
+
+
+@pytest.fixture
+def collect_items(pytester):
+    """Collect real pytest.Item objects from a test module source."""
+    pytester.makeini("""
+        [pytest]
+        markers =
+            run_days: run the test only on the given weekdays
+    """)
+    return pytester.getitems
+
+
+def test_run_days_marker_added_after_first_pass_is_honoured(collect_items):
+    (item,) = collect_items("def test_a(): pass")
+    stage = DateFilterStage(current_time=datetime(2024, 1, 1))  # Monday
+    assert stage.apply([item]) == [item]
+    item.add_marker(pytest.mark.run_days("tue"))
+    assert stage.apply([item]) == []
+
+
+@pytest.mark.parametrize("day_of_month, expected", [
+    (1, "test_function_level"),  # Monday
+    (2, "test_class_level"),  # Tuesday
+    (3, "test_module_level"),  # Wednesday
+])
+def test_run_days_closest_marker_on_function_class_and_module(collect_items, day_of_month, expected):
+    items = collect_items("""
+        import pytest
+
+        pytestmark = pytest.mark.run_days("wed")
+
+        def test_module_level(): pass
+
+        @pytest.mark.run_days("tue")
+        class TestScheduled:
+            def test_class_level(self): pass
+
+            @pytest.mark.run_days("mon")
+            def test_function_level(self): pass
+    """)
+    stage = DateFilterStage(current_time=datetime(2024, 1, day_of_month))
+    assert [item.name for item in stage.apply(items)] == [expected]
+
+
+def test_date_filter_grouping_stage_collects_groups_like_the_two_stages(collect_items):
+    monday = datetime(2024, 1, 1)
+    mappings = {"fast": ["quick"], "slow": ["slow"]}
+    # Referenced through the module so pytest does not try to collect the class
+    sequential = conftest.TestFilterPipeline([
+        DateFilterStage(monday), FixtureParameterGroupingStage(mappings, collect_groups=True),
+    ]).apply(collect_items(_DATED_PARAMETRIZED_MODULE))
+    fused = DateFilterGroupingStage(
+        DateFilterStage(monday), FixtureParameterGroupingStage(mappings, collect_groups=True),
+    ).apply(collect_items(_DATED_PARAMETRIZED_MODULE))
+
+    def names(items):
+        return [item.name for item in items]
+
+    assert {group: names(items) for group, items in fused.get_all_groups().items()} == {
+        group: names(items) for group, items in sequential.get_all_groups().items()
+    } == {"fast": ["test_any_day[quick]"], "slow": ["test_any_day[slow_detailed]"]}
+    assert names(fused.unmatched) == names(sequential.unmatched) == ["test_any_day[other]", "test_plain"]
+
+
+@pytest.mark.parametrize("day_of_month", [1, 2])  # Monday, Tuesday
+def test_date_filter_grouping_stage_matches_the_two_stages(collect_items, day_of_month):
+    today = datetime(2024, 1, day_of_month)
+    mappings = {"fast": ["quick"], "slow": ["slow"]}
+    sequential = conftest.TestFilterPipeline([
+        DateFilterStage(today), FixtureParameterGroupingStage(mappings),
+    ]).apply(collect_items(_DATED_PARAMETRIZED_MODULE))
+    fused = DateFilterGroupingStage(
+        DateFilterStage(today), FixtureParameterGroupingStage(mappings),
+    ).apply(collect_items(_DATED_PARAMETRIZED_MODULE))
+
+    def summary(items):
+        return [(item.name, [mark.name for mark in item.iter_markers()]) for item in items]
+
+    assert summary(fused) == summary(sequential)
+    assert len(fused) == (4 if day_of_month == 1 else 6)
+
+
+def test_grouping_only_reads_the_named_fixture_parameter(collect_items):
+    items = collect_items("""
+        import pytest
+
+        @pytest.mark.parametrize("mode, other", [("quick", "slow"), ("slow", "quick")])
+        def test_two_params(mode, other): pass
+    """)
+    FixtureParameterGroupingStage({"fast": ["quick"], "slow": ["slow"]}, fixture_name="mode").apply(items)
+    assert [(item.name, _group_markers(item)) for item in items] == [
+        ("test_two_params[quick-slow]", ["fast"]),
+        ("test_two_params[slow-quick]", ["slow"]),
+    ]
+
+
+def test_group_matched_by_several_parameters_is_applied_once(collect_items):
+    (item,) = collect_items("""
+        import pytest
+
+        @pytest.mark.parametrize("first, second", [("quick", "quick_too")])
+        def test_both_fast(first, second): pass
+    """)
+    groups = FixtureParameterGroupingStage({"fast": ["quick"], "slow": ["slow"]}, collect_groups=True).apply([item])
+    assert _group_markers(item) == ["fast"]
+    assert groups.get_group("fast") == [item]
+    assert groups.get_group("slow") == groups.unmatched == []
+
+
+def test_empty_pipeline_returns_the_items_unchanged(collect_items):
+    items = collect_items("def test_a(): pass")
+    assert conftest.TestFilterPipeline().apply(items) is items
+
+
+def test_register_group_markers_adds_missing_names_once(pytester):
+    pytester.makeini("""
+        [pytest]
+        markers =
+            fast: tests that run quickly
+    """)
+    pytester.makepyfile("""
+        import pytest
+
+        @pytest.mark.turbo
+        def test_turbo(): pass
+    """)
+
+    class RegisterTwice:
+        def pytest_configure(self, config):
+            self.config = config
+            conftest._register_group_markers(config, ["fast", "turbo"])
+            conftest._register_group_markers(config, ["turbo"])
+
+    plugin = RegisterTwice()
+    pytester.inline_run("--strict-markers", plugins=[plugin]).assertoutcome(passed=1)
+    names = [line.split(":", 1)[0].strip() for line in plugin.config.getini("markers")]
+    assert names.count("fast") == names.count("turbo") == 1
+
+
+def test_grouping_stage_keeps_a_read_only_copy_of_its_mappings():
+    mappings = {}
+    stage = FixtureParameterGroupingStage(mappings)
+    mappings["fast"] = ["quick"]
+    assert dict(stage.group_mappings) == {}
+    with pytest.raises(TypeError):
+        stage.group_mappings["fast"] = ("quick",)
+
+
+def test_parameter_scan_stops_once_every_matchable_group_matched():
+    stage = FixtureParameterGroupingStage({"fast": ["quick"], "none": []})
+    assert stage._match_parameters(("quick", "never_matched")) == (0,)
+    # The second string was never matched because "none" cannot match anything
+    assert "never_matched" not in stage._value_to_idxs
+
+
+def test_date_filter_stage_reads_the_clock_once_until_reset(monkeypatch):
+    clock = iter([datetime(2024, 1, 1), datetime(2024, 1, 2)])  # Monday, then Tuesday
+
+    class FakeDatetime:
+        @staticmethod
+        def now():
+            return next(clock)
+
+    monkeypatch.setattr(conftest, "datetime", FakeDatetime)
+    tuesday_only = _MarkedItem(pytest.mark.run_days("tue"))
+    stage = DateFilterStage()
+    assert stage.apply([tuesday_only]) == []
+    assert stage.apply([tuesday_only]) == []
+    assert stage.current_weekday() == 0
+    stage.reset()
+    assert stage.apply([tuesday_only]) == [tuesday_only]
\ No newline at end of file